@@ -29,6 +29,12 @@ class Settings(BaseSettings):
 
     cache_ttl_s: float = 120.0
     cache_max_size: int = 512
+    # TTL for cached failures ("location not found", upstream 429/5xx).
+    negative_ttl_s: float = 30.0
+
+    # Optional shared cache (e.g. redis://localhost:6379/0); in-memory only when unset.
+    redis_url: Optional[str] = None
+    redis_timeout_s: float = 1.0
 
 
 @lru_cache
@@ -1,20 +1,42 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
 
 import aiohttp
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 
 from app.config import get_settings
-from app.models import Place, SearchRequest
+from app.models import PLACE_LIST_ADAPTER, Place, SearchRequest
+from app.services import accessibility
 from app.services.accessibility import fetch_accessible_places, geocode_query, list_categories
 
 settings = get_settings()
 
+# Categories are fixed for the process lifetime, so the response body is encoded once.
+_CATEGORIES_JSON = orjson.dumps({"categories": list_categories()})
+_CATEGORIES_HEADERS = {"Cache-Control": "public, max-age=86400, immutable"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # One shared session per process: keep-alive connections to Nominatim/Overpass are reused.
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75)
+    app.state.http = aiohttp.ClientSession(connector=connector)
+    try:
+        yield
+    finally:
+        await app.state.http.close()
+        if accessibility.redis_client is not None:
+            await accessibility.redis_client.aclose()
+
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     description="Service to find accessible places using OpenStreetMap data.",
+    lifespan=lifespan,
 )
 
 
@@ -28,26 +50,36 @@ async def health():
     return {"ok": True}
 
 
-@app.get("/api/categories", tags=["Api Categories"])
+@app.get(
+    "/api/categories",
+    response_class=Response,
+    responses={200: {"content": {"application/json": {}}}},
+    tags=["Api Categories"],
+)
 async def api_categories():
-    return {"categories": list_categories()}
+    return Response(content=_CATEGORIES_JSON, media_type="application/json", headers=_CATEGORIES_HEADERS)
 
 
 @app.get("/api/geocode", tags=["Api Geocode"])
-async def api_geocode(q: str = Query(..., min_length=2, description="Free-text location query")):
-    async with aiohttp.ClientSession() as session:
-        try:
-            lat, lon, display_name = await geocode_query(session, q)
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
-        except aiohttp.ClientResponseError as e:
-            raise HTTPException(status_code=502, detail=f"Nominatim error: {e.status}")
+async def api_geocode(request: Request, q: str = Query(..., min_length=2, description="Free-text location query")):
+    try:
+        lat, lon, display_name = await geocode_query(request.app.state.http, q)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except aiohttp.ClientResponseError as e:
+        raise HTTPException(status_code=502, detail=f"Nominatim error: {e.status}")
 
     return {"query": q, "lat": lat, "lon": lon, "display_name": display_name}
 
 
-@app.get("/api/search", response_model=List[Place], tags=["Api Search"])
+def _places_response(places: List[Place]) -> Response:
+    return Response(content=PLACE_LIST_ADAPTER.dump_json(places), media_type="application/json")
+
+
+# `responses` keeps the List[Place] schema in OpenAPI; the body itself is dumped by PLACE_LIST_ADAPTER.
+@app.get("/api/search", response_class=Response, responses={200: {"model": List[Place]}}, tags=["Api Search"])
 async def api_search(
+    request: Request,
     lat: float = Query(..., ge=-90.0, le=90.0),
     lon: float = Query(..., ge=-180.0, le=180.0),
     category: str = Query(..., min_length=1),
@@ -57,37 +89,36 @@ async def api_search(
     toilets_wheelchair: Optional[str] = Query(None, pattern="^(yes|no|unknown)$"),
     step_free: Optional[bool] = Query(None),
 ):
-    async with aiohttp.ClientSession() as session:
-        try:
-            places = await fetch_accessible_places(
-                session,
-                lat=lat,
-                lon=lon,
-                category=category,
-                radius_m=radius_m,
-                limit=limit,
-                wheelchair=wheelchair,
-                toilets_wheelchair=toilets_wheelchair,
-                step_free=step_free,
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except aiohttp.ClientResponseError as e:
-            raise HTTPException(status_code=502, detail=f"Overpass error: {e.status}")
-
-    return places
-
-
-@app.post("/search", response_model=List[Place], tags=["Search Places"])
-async def legacy_search(req: SearchRequest):
+    try:
+        places = await fetch_accessible_places(
+            request.app.state.http,
+            lat=lat,
+            lon=lon,
+            category=category,
+            radius_m=radius_m,
+            limit=limit,
+            wheelchair=wheelchair,
+            toilets_wheelchair=toilets_wheelchair,
+            step_free=step_free,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except aiohttp.ClientResponseError as e:
+        raise HTTPException(status_code=502, detail=f"Overpass error: {e.status}")
+
+    return _places_response(places)
+
+
+@app.post("/search", response_class=Response, responses={200: {"model": List[Place]}}, tags=["Search Places"])
+async def legacy_search(request: Request, req: SearchRequest):
     """Legacy endpoint (kept for compatibility). Prefer GET /api/geocode + GET /api/search."""
-    async with aiohttp.ClientSession() as session:
-        try:
-            lat, lon, _ = await geocode_query(session, req.query)
-            places = await fetch_accessible_places(session, lat=lat, lon=lon, category=req.category)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        except aiohttp.ClientResponseError as e:
-            raise HTTPException(status_code=502, detail=f"Upstream error: {e.status}")
-
-    return places
+    session = request.app.state.http
+    try:
+        lat, lon, _ = await geocode_query(session, req.query)
+        places = await fetch_accessible_places(session, lat=lat, lon=lon, category=req.category)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except aiohttp.ClientResponseError as e:
+        raise HTTPException(status_code=502, detail=f"Upstream error: {e.status}")
+
+    return _places_response(places)
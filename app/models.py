@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import List
+
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class SearchRequest(BaseModel):
@@ -17,3 +19,7 @@ class Place(BaseModel):
     osm_id: int
     osm_type: str
     category: str
+
+
+# Built once: dumping search results through it skips FastAPI's response_model re-validation.
+PLACE_LIST_ADAPTER = TypeAdapter(List[Place])
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import math
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+import random
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
 
 import aiohttp
+import ijson
+import numpy as np
+import orjson
 
 from app.config import get_settings
 from app.models import Place
-from app.services.cache import TTLCache, make_cache_key
+from app.services.cache import RedisJSONCache, TTLCache, make_cache_key, make_redis_client
+
+T = TypeVar("T")
 
 # Very small starter mapping (easy to extend)
 # If you want a new category: add more tag tuples for it (key, value).
@@ -37,29 +47,212 @@ _STEP_FREE_KEYS = (
     "step_count",
 )
 
-YES_VALUES = {"yes", "true", "1"}
-NO_VALUES = {"no", "false", "0"}
+# Overpass queries up to this URL-encoded size are sent as GET (cacheable by the instance front-end).
+_OVERPASS_MAX_GET_LEN = 8 * 1024
+# Overpass bodies with a Content-Length below these are parsed in one go with orjson (several
+# times faster); larger or unsized ones are stream-parsed element by element. For compressed
+# bodies Content-Length is the wire size, and JSON element arrays inflate ~10x under gzip.
+_OVERPASS_STREAM_MIN_BYTES = 1024 * 1024
+_OVERPASS_STREAM_MIN_COMPRESSED_BYTES = 100 * 1024
+
+YES_VALUES = frozenset({"yes", "true", "1"})
+NO_VALUES = frozenset({"no", "false", "0"})
 
 _settings = get_settings()
+
+
+class _HostLimiter:
+    """Caps concurrent requests to one upstream host and optionally spaces out their starts."""
+
+    def __init__(self, concurrency: int, min_interval_s: float = 0.0) -> None:
+        self._sem = asyncio.Semaphore(concurrency)
+        self.min_interval_s = min_interval_s
+        self._next_start = 0.0
+
+    async def __aenter__(self) -> None:
+        await self._sem.acquire()
+        delay = self._next_start - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # __aexit__ won't run if we're cancelled here: give the slot back ourselves.
+                self._sem.release()
+                raise
+        self._next_start = time.monotonic() + self.min_interval_s
+
+    async def __aexit__(self, *exc: object) -> None:
+        self._sem.release()
+
+
+# Per-process politeness: Nominatim allows 1 req/s, Overpass a handful of parallel slots.
+_nominatim_limiter = _HostLimiter(1, min_interval_s=1.0)
+_overpass_limiter = _HostLimiter(4)
+
+# Upstream lookups currently running, by cache key. Concurrent misses for the same key await
+# the same task instead of each hitting Nominatim/Overpass (no lock needed: there is no await
+# between the lookup and the insert).
+_inflight: Dict[str, asyncio.Task[Any]] = {}
+
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_S = 0.5
+_RETRY_MAX_DELAY_S = 10.0
+
 _geocode_cache: TTLCache[Tuple[float, float, str]] = TTLCache(
     ttl_s=_settings.cache_ttl_s, max_size=_settings.cache_max_size
 )
 _search_cache: TTLCache[List[Place]] = TTLCache(
     ttl_s=_settings.cache_ttl_s, max_size=_settings.cache_max_size
 )
+# Negative caches: "not found" and upstream overload errors are replayed for a short time
+# instead of hitting Nominatim/Overpass again with the same failing request. They hold plain
+# data (`_NOT_FOUND` or (request_info, status, message, headers)) and every hit raises a fresh exception:
+# a cached exception object would pin its ever-growing traceback and the handler frames in it.
+_NOT_FOUND = object()
+_geocode_errors: TTLCache[object] = TTLCache(
+    ttl_s=_settings.negative_ttl_s, max_size=_settings.cache_max_size
+)
+_search_errors: TTLCache[object] = TTLCache(
+    ttl_s=_settings.negative_ttl_s, max_size=_settings.cache_max_size
+)
+
+# Shared (cross-process) layer behind the in-memory caches; None when REDIS_URL is not configured.
+redis_client = make_redis_client(_settings.redis_url, timeout_s=_settings.redis_timeout_s)
+_geocode_shared: Optional[RedisJSONCache] = None
+_search_shared: Optional[RedisJSONCache] = None
+if redis_client is not None:
+    _geocode_shared = RedisJSONCache(redis_client, namespace="af:geocode:", ttl_s=_settings.cache_ttl_s)
+    _search_shared = RedisJSONCache(redis_client, namespace="af:search:", ttl_s=_settings.cache_ttl_s)
+
+
+async def _cache_get(
+    local: TTLCache[T], shared: Optional[RedisJSONCache], key: str, decode: Callable[[Any], T]
+) -> Optional[T]:
+    value = local.get(key)
+    if value is None and shared is not None:
+        raw = await shared.get(key)
+        if raw is not None:
+            value = decode(raw)
+            local.set(key, value)
+    return value
+
+
+async def _cache_set(local: TTLCache[T], shared: Optional[RedisJSONCache], key: str, value: T, raw: Any) -> None:
+    local.set(key, value)
+    if shared is not None:
+        await shared.set(key, raw)
+
+
+def _retry_delay_s(exc: aiohttp.ClientResponseError, attempt: int) -> float:
+    retry_after = (exc.headers or {}).get("Retry-After")
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), _RETRY_MAX_DELAY_S)
+        except ValueError:
+            pass  # HTTP-date form: fall back to exponential backoff
+    return min(_RETRY_BASE_S * 2**attempt + random.uniform(0, _RETRY_BASE_S), _RETRY_MAX_DELAY_S)
+
+
+def _invalid_body(resp: aiohttp.ClientResponse, exc: Exception) -> aiohttp.ClientResponseError:
+    # A 200 with a non-JSON body (e.g. an HTML "busy" page) is an upstream failure, not a bad
+    # request: orjson's decode error subclasses ValueError, which the routes map to 4xx.
+    return aiohttp.ClientResponseError(
+        resp.request_info, resp.history, status=resp.status, message=f"Invalid JSON body: {exc}", headers=resp.headers
+    )
+
+
+async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+    body = await resp.read()
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise _invalid_body(resp, e) from None
+
+
+async def _fetch(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    *,
+    limiter: _HostLimiter,
+    handle: Callable[[aiohttp.ClientResponse], Awaitable[T]] = _read_json,
+    **kwargs: Any,
+) -> T:
+    """Send a request through `limiter` and `handle` the response, retrying transient upstream errors."""
+    for attempt in range(_RETRY_ATTEMPTS):
+        try:
+            async with limiter:
+                async with session.request(method, url, **kwargs) as resp:
+                    resp.raise_for_status()
+                    return await handle(resp)
+        except aiohttp.ClientResponseError as e:
+            if e.status not in _RETRY_STATUSES or attempt == _RETRY_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(_retry_delay_s(e, attempt))
+
+
+async def _single_flight(key: str, load: Callable[[], Awaitable[T]]) -> T:
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(load())
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: a caller that disconnects must not cancel the lookup other callers are waiting on
+    return await asyncio.shield(task)
+
+
+def _is_negative_cacheable(exc: aiohttp.ClientResponseError) -> bool:
+    return exc.status == 429 or exc.status >= 500
+
+
+def _remember_error(errors: TTLCache[object], key: str, exc: aiohttp.ClientResponseError) -> None:
+    if _is_negative_cacheable(exc):
+        errors.set(key, (exc.request_info, exc.status, exc.message, exc.headers))
+
+
+def _raise_cached_error(errors: TTLCache[object], key: str) -> None:
+    failed = errors.get(key)
+    if failed is None:
+        return
+    if failed is _NOT_FOUND:
+        raise ValueError("Location not found")
+    request_info, status, message, headers = failed
+    raise aiohttp.ClientResponseError(request_info, (), status=status, message=message, headers=headers)
+
+
+def _decode_geocode(raw: Any) -> Tuple[float, float, str]:
+    lat, lon, display_name = raw
+    return float(lat), float(lon), str(display_name)
 
 
-def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Distance in meters between two WGS84 coords."""
-    r = 6371000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
+def _decode_places(raw: Any) -> List[Place]:
+    return [Place.model_construct(**item) for item in raw]
 
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
+
+def _haversine_many_m(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Haversine distances in meters from one WGS84 origin to arrays of WGS84 coords."""
+    phi1 = math.radians(lat)
+    phi2 = np.radians(lats)
+    sin_dphi = np.sin((phi2 - phi1) * 0.5)
+    sin_dlambda = np.sin(np.radians(lons - lon) * 0.5)
+
+    a = sin_dphi * sin_dphi + math.cos(phi1) * np.cos(phi2) * (sin_dlambda * sin_dlambda)
+    # 2*asin(sqrt(a)) == 2*atan2(sqrt(a), sqrt(1-a)); clip guards rounding just above 1.
+    return 2 * 6371000.0 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _nearest_candidates(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray, k: int) -> np.ndarray:
+    """Indices (ascending) of the `k` points closest to (lat, lon) by a cheap equirectangular bound.
+
+    Used to trim candidates before the exact haversine; `k` should leave some slack over the result size.
+    """
+    if len(lats) <= k:
+        return np.arange(len(lats))
+    cos_lat = math.cos(math.radians(lat))
+    dlon = (lons - lon + 180.0) % 360.0 - 180.0  # shortest way round the antimeridian
+    approx = (lats - lat) ** 2 + (dlon * cos_lat) ** 2
+    return np.sort(np.argpartition(approx, k)[:k])
 
 
 def _addr_from_tags(tags: Dict[str, Any]) -> str:
@@ -76,46 +269,163 @@ def _addr_from_tags(tags: Dict[str, Any]) -> str:
     return ", ".join(parts)
 
 
-def _tag_match(value: Optional[str], desired: Optional[str]) -> bool:
+def _accepted_values(desired: Optional[str]) -> Optional[frozenset[Optional[str]]]:
+    """Tag values matching a filter, or None when the filter is off ("unknown" also matches a missing tag)."""
     if desired is None:
-        return True
+        return None
     if desired == "unknown":
-        return value is None or value == "unknown"
-    return value == desired
+        return frozenset({None, "unknown"})
+    return frozenset({desired})
 
 
 def _step_free_value(tags: Dict[str, Any]) -> Optional[bool]:
-    # best-effort: infer step-free from known tags
-    for k in ("step_free_access", "step_free", "entrance:step_free"):
-        v = tags.get(k)
-        if isinstance(v, str):
-            vv = v.strip().lower()
-            if vv in YES_VALUES:
-                return True
-            if vv in NO_VALUES:
-                return False
+    # best-effort: infer step-free from known tags.
+    # Hot path (once per element): explicit tags.get calls, no key-tuple loop or helper calls.
+    v = tags.get("step_free_access")
+    if isinstance(v, str):
+        vv = v.strip().lower()
+        if vv in YES_VALUES:
+            return True
+        if vv in NO_VALUES:
+            return False
+    v = tags.get("step_free")
+    if isinstance(v, str):
+        vv = v.strip().lower()
+        if vv in YES_VALUES:
+            return True
+        if vv in NO_VALUES:
+            return False
+    v = tags.get("entrance:step_free")
+    if isinstance(v, str):
+        vv = v.strip().lower()
+        if vv in YES_VALUES:
+            return True
+        if vv in NO_VALUES:
+            return False
 
     # step_count=0 => step-free; any positive => not step-free
-    for k in ("entrance:step_count", "step_count"):
-        v = tags.get(k)
-        if v is None:
-            continue
+    v = tags.get("entrance:step_count")
+    if v is not None:
+        try:
+            return int(str(v).strip()) == 0
+        except ValueError:
+            pass
+    v = tags.get("step_count")
+    if v is not None:
         try:
-            n = int(str(v).strip())
-            return n == 0
+            return int(str(v).strip()) == 0
         except ValueError:
-            continue
+            pass
 
     return None
 
 
+class _PlaceCollector:
+    """Dedups and filters Overpass elements, keeping only the `n` nearest to (lat, lon).
+
+    Survivors (with their tags) are buffered and compacted every `batch` additions, so they take
+    O(n + batch) memory however many elements the response holds; only the dedup set of
+    (type, id) pairs grows with the response. Equal distances keep Overpass order.
+    """
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        n: int,
+        *,
+        wheelchair: Optional[str],
+        toilets_wheelchair: Optional[str],
+        step_free: Optional[bool],
+        batch: int = 2048,
+    ) -> None:
+        self.lat = lat
+        self.lon = lon
+        self.n = n
+        self.batch = batch
+        self.step_free = step_free
+        self._wheelchair_ok = _accepted_values(wheelchair)
+        self._toilets_ok = _accepted_values(toilets_wheelchair)
+        # Deduplicate by (type, id)
+        self._seen: set[tuple[str, int]] = set()
+        self._kept: list[tuple[str, int, Dict[str, Any]]] = []
+        self._plats: list[float] = []
+        self._plons: list[float] = []
+
+    def feed(self, el: Dict[str, Any]) -> None:
+        osm_type = str(el.get("type", ""))
+        osm_id = int(el.get("id", 0))
+        key = (osm_type, osm_id)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+
+        # Coordinates: node => lat/lon, others => center
+        if osm_type == "node":
+            plat = el.get("lat")
+            plon = el.get("lon")
+        else:
+            center = el.get("center") or {}
+            plat = center.get("lat")
+            plon = center.get("lon")
+
+        if plat is None or plon is None:
+            return
+
+        tags = el.get("tags") or {}
+
+        # Filters
+        if self._wheelchair_ok is not None and tags.get("wheelchair") not in self._wheelchair_ok:
+            return
+        if self._toilets_ok is not None and tags.get("toilets:wheelchair") not in self._toilets_ok:
+            return
+
+        step_val = _step_free_value(tags)
+        if self.step_free is True and step_val is not True:
+            return
+        if self.step_free is False and step_val is True:
+            return
+
+        self._kept.append((osm_type, osm_id, tags))
+        self._plats.append(float(plat))
+        self._plons.append(float(plon))
+        if len(self._kept) >= self.n + self.batch:
+            self._compact()
+
+    def _compact(self) -> np.ndarray:
+        """Keep the `n` nearest survivors, ordered by distance; returns their distances."""
+        lats_arr = np.asarray(self._plats, dtype=np.float64)
+        lons_arr = np.asarray(self._plons, dtype=np.float64)
+        candidates = _nearest_candidates(self.lat, self.lon, lats_arr, lons_arr, 2 * self.n)
+        dists = _haversine_many_m(self.lat, self.lon, lats_arr[candidates], lons_arr[candidates])
+        order = np.argsort(dists, kind="stable")[: self.n]
+        keep = candidates[order].tolist()
+        self._kept = [self._kept[i] for i in keep]
+        self._plats = [self._plats[i] for i in keep]
+        self._plons = [self._plons[i] for i in keep]
+        return dists[order]
+
+    def nearest(self) -> list[tuple[str, int, Dict[str, Any], float, float, float]]:
+        """(osm_type, osm_id, tags, lat, lon, distance_m) of the nearest survivors, closest first."""
+        dists = self._compact().tolist()
+        return [
+            (osm_type, osm_id, tags, plat, plon, dist)
+            for (osm_type, osm_id, tags), plat, plon, dist in zip(self._kept, self._plats, self._plons, dists)
+        ]
+
+
 async def geocode_query(session: aiohttp.ClientSession, q: str) -> Tuple[float, float, str]:
     """Geocode a free-text location query (Nominatim). Returns (lat, lon, display_name)."""
-    settings = get_settings()
     cache_key = make_cache_key("geocode", q.strip().lower())
-    cached = _geocode_cache.get(cache_key)
+    cached = await _cache_get(_geocode_cache, _geocode_shared, cache_key, _decode_geocode)
     if cached is not None:
         return cached
+    _raise_cached_error(_geocode_errors, cache_key)
+    return await _single_flight(cache_key, lambda: _geocode_upstream(session, q, cache_key))
+
+
+async def _geocode_upstream(session: aiohttp.ClientSession, q: str, cache_key: str) -> Tuple[float, float, str]:
+    settings = get_settings()
     params = {
         "q": q,
         "format": "jsonv2",
@@ -128,19 +438,32 @@ async def geocode_query(session: aiohttp.ClientSession, q: str) -> Tuple[float,
     headers = {"User-Agent": settings.user_agent}
     timeout = aiohttp.ClientTimeout(total=settings.http_timeout_s)
 
-    async with session.get(str(settings.nominatim_base_url), params=params, headers=headers, timeout=timeout) as resp:
-        resp.raise_for_status()
-        data = await resp.json()
+    try:
+        data = await _fetch(
+            session,
+            "GET",
+            str(settings.nominatim_base_url),
+            limiter=_nominatim_limiter,
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
+    except aiohttp.ClientResponseError as e:
+        _remember_error(_geocode_errors, cache_key, e)
+        raise
 
     if not data:
+        _geocode_errors.set(cache_key, _NOT_FOUND)
         raise ValueError("Location not found")
 
     item = data[0]
     result = (float(item["lat"]), float(item["lon"]), str(item.get("display_name", "")))
-    _geocode_cache.set(cache_key, result)
+    await _cache_set(_geocode_cache, _geocode_shared, cache_key, result, list(result))
     return result
 
 
+# Both helpers are pure over CATEGORY_TAGS; cached results are shared, so callers must not mutate them.
+@lru_cache(maxsize=128)
 def _category_filters(category: str) -> List[Tuple[str, str]]:
     # Allow power-user form: "key=value"
     if "=" in category and len(category.split("=", 1)[0]) > 0:
@@ -155,6 +478,7 @@ def _category_filters(category: str) -> List[Tuple[str, str]]:
     return CATEGORY_TAGS[category]
 
 
+@lru_cache(maxsize=1)
 def list_categories() -> dict[str, list[dict[str, str]]]:
     return {
         name: [{"key": key, "value": value} for key, value in tags]
@@ -162,24 +486,29 @@ def list_categories() -> dict[str, list[dict[str, str]]]:
     }
 
 
-def _overpass_query(lat: float, lon: float, radius_m: int, tag_key: str, tag_value: str,
+def _overpass_query(lat: float, lon: float, radius_m: int, cat_filters: List[Tuple[str, str]],
                     wheelchair: Optional[str], toilets_wheelchair: Optional[str]) -> str:
-    extra = ""
+    extra_parts = []
     # If we can push filters to Overpass - do it (unknown can't be expressed reliably)
     if wheelchair and wheelchair != "unknown":
-        extra += f'[wheelchair={wheelchair}]'
+        extra_parts.append(f"[wheelchair={wheelchair}]")
     if toilets_wheelchair and toilets_wheelchair != "unknown":
-        extra += f'["toilets:wheelchair"={toilets_wheelchair}]'
+        extra_parts.append(f'["toilets:wheelchair"={toilets_wheelchair}]')
+    extra = "".join(extra_parts)
 
+    # All tag filters of a category are OR-ed in one union, so a category costs one round-trip.
     # Note: for ways/relations we request center.
-    return f"""[out:json][timeout:25];
-(
-  node(around:{radius_m},{lat},{lon})[{tag_key}={tag_value}]{extra};
-  way(around:{radius_m},{lat},{lon})[{tag_key}={tag_value}]{extra};
-  relation(around:{radius_m},{lat},{lon})[{tag_key}={tag_value}]{extra};
-);
-out center tags;
-"""
+    # f-strings compile to BUILD_STRING; str.format templates would re-parse on every call.
+    around = f"(around:{radius_m},{lat},{lon})"
+    statements = "".join(
+        [
+            f"  node{around}[{k}={v}]{extra};\n"
+            f"  way{around}[{k}={v}]{extra};\n"
+            f"  relation{around}[{k}={v}]{extra};\n"
+            for k, v in cat_filters
+        ]
+    )
+    return f"[out:json][timeout:25];\n(\n{statements});\nout center tags;\n"
 
 
 async def fetch_accessible_places(
@@ -195,8 +524,6 @@ async def fetch_accessible_places(
     step_free: Optional[bool] = None,
 ) -> List[Place]:
     """Search places by category near (lat, lon) using Overpass."""
-    settings = get_settings()
-
     if radius_m is None:
         radius_m = 1500
 
@@ -211,78 +538,109 @@ async def fetch_accessible_places(
         toilets_wheelchair or "",
         step_free,
     )
-    cached = _search_cache.get(cache_key)
+    cached = await _cache_get(_search_cache, _search_shared, cache_key, _decode_places)
     if cached is not None:
         return cached
+    _raise_cached_error(_search_errors, cache_key)
 
     cat_filters = _category_filters(category)
+    return await _single_flight(
+        cache_key,
+        lambda: _search_upstream(
+            session,
+            cache_key,
+            lat=lat,
+            lon=lon,
+            category=category,
+            cat_filters=cat_filters,
+            radius_m=radius_m,
+            limit=limit,
+            wheelchair=wheelchair,
+            toilets_wheelchair=toilets_wheelchair,
+            step_free=step_free,
+        ),
+    )
 
-    timeout = aiohttp.ClientTimeout(total=settings.http_timeout_s)
-
-    elements: list[dict[str, Any]] = []
-    for (k, v) in cat_filters:
-        query = _overpass_query(lat, lon, radius_m, k, v, wheelchair, toilets_wheelchair)
-        async with session.post(str(settings.overpass_base_url), data={"data": query}, timeout=timeout) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-        elements.extend(data.get("elements", []))
-
-    # Deduplicate by (type, id)
-    seen: set[tuple[str, int]] = set()
-    places: list[Place] = []
 
-    for el in elements:
-        osm_type = str(el.get("type", ""))
-        osm_id = int(el.get("id", 0))
-        key = (osm_type, osm_id)
-        if key in seen:
-            continue
-        seen.add(key)
+async def _search_upstream(
+    session: aiohttp.ClientSession,
+    cache_key: str,
+    *,
+    lat: float,
+    lon: float,
+    category: str,
+    cat_filters: List[Tuple[str, str]],
+    radius_m: int,
+    limit: int,
+    wheelchair: Optional[str],
+    toilets_wheelchair: Optional[str],
+    step_free: Optional[bool],
+) -> List[Place]:
+    settings = get_settings()
+    timeout = aiohttp.ClientTimeout(total=settings.http_timeout_s)
 
-        # Coordinates: node => lat/lon, others => center
-        if osm_type == "node":
-            plat = el.get("lat")
-            plon = el.get("lon")
+    query = _overpass_query(lat, lon, radius_m, cat_filters, wheelchair, toilets_wheelchair)
+    payload = {"data": query}
+    if len(urlencode(payload)) <= _OVERPASS_MAX_GET_LEN:
+        method, body = "GET", {"params": payload}
+    else:
+        method, body = "POST", {"data": payload}
+    headers = {"Accept-Encoding": "gzip"}
+    n = max(1, min(limit, 100))
+
+    async def collect(resp: aiohttp.ClientResponse) -> _PlaceCollector:
+        collector = _PlaceCollector(
+            lat, lon, n, wheelchair=wheelchair, toilets_wheelchair=toilets_wheelchair, step_free=step_free
+        )
+        length = resp.content_length
+        encoding = resp.headers.get("Content-Encoding", "identity").lower()
+        if encoding == "identity":
+            stream_min = _OVERPASS_STREAM_MIN_BYTES
         else:
-            center = el.get("center") or {}
-            plat = center.get("lat")
-            plon = center.get("lon")
-
-        if plat is None or plon is None:
-            continue
-
-        tags = el.get("tags") or {}
-
-        # Filters
-        if not _tag_match(tags.get("wheelchair"), wheelchair):
-            continue
-        if not _tag_match(tags.get("toilets:wheelchair"), toilets_wheelchair):
-            continue
-
-        step_val = _step_free_value(tags)
-        if step_free is True and step_val is not True:
-            continue
-        if step_free is False and step_val is True:
-            continue
+            stream_min = _OVERPASS_STREAM_MIN_COMPRESSED_BYTES
+        if length is not None and length < stream_min:
+            for el in (await _read_json(resp)).get("elements", []):
+                collector.feed(el)
+        else:
+            # Large (up to tens of MB at 50 km) or unsized body: never hold it all in memory.
+            try:
+                async for el in ijson.items_async(resp.content, "elements.item", use_float=True):
+                    collector.feed(el)
+            except ijson.JSONError as e:
+                raise _invalid_body(resp, e) from None
+        return collector
+
+    try:
+        collector = await _fetch(
+            session,
+            method,
+            str(settings.overpass_base_url),
+            limiter=_overpass_limiter,
+            handle=collect,
+            headers=headers,
+            timeout=timeout,
+            **body,
+        )
+    except aiohttp.ClientResponseError as e:
+        _remember_error(_search_errors, cache_key, e)
+        raise
 
+    # Every field below is already coerced to its model type, so skip pydantic validation.
+    result: list[Place] = []
+    for osm_type, osm_id, tags, plat, plon, dist in collector.nearest():
         name = tags.get("name") or tags.get("brand") or f"{category} ({osm_type}:{osm_id})"
-        address = _addr_from_tags(tags)
-        dist = _haversine_m(lat, lon, float(plat), float(plon))
-
-        places.append(
-            Place(
+        result.append(
+            Place.model_construct(
                 name=str(name),
-                lat=float(plat),
-                lon=float(plon),
-                distance_m=float(dist),
-                address=address,
+                lat=plat,
+                lon=plon,
+                distance_m=dist,
+                address=_addr_from_tags(tags),
                 osm_id=osm_id,
                 osm_type=osm_type,
                 category=category,
             )
         )
 
-    places.sort(key=lambda p: p.distance_m)
-    result = places[: max(1, min(limit, 100))]
-    _search_cache.set(cache_key, result)
+    await _cache_set(_search_cache, _search_shared, cache_key, result, [p.model_dump() for p in result])
     return result
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import hashlib
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Generic, Optional, Tuple, TypeVar
+from typing import Any, Generic, Optional, Tuple, TypeVar
+
+import orjson
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
 
 T = TypeVar("T")
 
@@ -15,44 +21,106 @@ class CacheEntry(Generic[T]):
 
 
 class TTLCache(Generic[T]):
-    """Simple in-memory TTL cache with max size eviction."""
+    """Simple in-memory TTL cache with LRU eviction once max size is reached.
+
+    Not thread-safe: meant for a single asyncio event loop, where no `await` happens inside
+    `get`/`set`. Use `ThreadSafeTTLCache` when sharing across threads.
+    """
 
     def __init__(self, *, ttl_s: float, max_size: int) -> None:
         self.ttl_s = ttl_s
         self.max_size = max_size
-        self._store: Dict[str, CacheEntry[T]] = {}
-        self._lock = threading.Lock()
+        self._store: OrderedDict[str, CacheEntry[T]] = OrderedDict()
+        # Expired entries are swept once every `max_size` sets, keeping `set` amortized O(1).
+        self._sets_since_purge = 0
 
     def get(self, key: str) -> Optional[T]:
         now = time.monotonic()
-        with self._lock:
-            entry = self._store.get(key)
-            if entry is None:
-                return None
-            if entry.expires_at < now:
-                self._store.pop(key, None)
-                return None
-            return entry.value
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at < now:
+            self._store.pop(key, None)
+            return None
+        self._store.move_to_end(key)
+        return entry.value
 
     def set(self, key: str, value: T) -> None:
         now = time.monotonic()
-        with self._lock:
+        self._sets_since_purge += 1
+        if self._sets_since_purge >= self.max_size:
             self._purge_expired(now)
-            if len(self._store) >= self.max_size:
-                self._evict_oldest()
-            self._store[key] = CacheEntry(value=value, expires_at=now + self.ttl_s)
+        if key in self._store:
+            self._store.move_to_end(key)
+        elif len(self._store) >= self.max_size:
+            self._evict_oldest()
+        self._store[key] = CacheEntry(value=value, expires_at=now + self.ttl_s)
 
     def _purge_expired(self, now: float) -> None:
         expired_keys = [key for key, entry in self._store.items() if entry.expires_at < now]
         for key in expired_keys:
             self._store.pop(key, None)
+        self._sets_since_purge = 0
 
     def _evict_oldest(self) -> None:
-        if not self._store:
-            return
-        oldest_key = min(self._store.items(), key=lambda item: item[1].expires_at)[0]
-        self._store.pop(oldest_key, None)
+        if self._store:
+            self._store.popitem(last=False)
+
+
+class ThreadSafeTTLCache(TTLCache[T]):
+    """`TTLCache` guarded by a lock, for use from worker threads (e.g. `run_in_executor`)."""
+
+    def __init__(self, *, ttl_s: float, max_size: int) -> None:
+        super().__init__(ttl_s=ttl_s, max_size=max_size)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[T]:
+        with self._lock:
+            return super().get(key)
+
+    def set(self, key: str, value: T) -> None:
+        with self._lock:
+            super().set(key, value)
+
+
+class RedisJSONCache:
+    """Namespaced JSON cache in Redis, shared by every worker process.
+
+    Redis failures are swallowed (treated as a miss / no-op) so callers can keep serving
+    from their in-process `TTLCache`.
+    """
+
+    def __init__(self, client: redis_asyncio.Redis, *, namespace: str, ttl_s: float) -> None:
+        self.client = client
+        self.namespace = namespace
+        self.ttl_s = ttl_s
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self.namespace + key)
+        except (RedisError, OSError):
+            return None
+        if raw is None:
+            return None
+        return orjson.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self.client.setex(self.namespace + key, max(1, round(self.ttl_s)), orjson.dumps(value))
+        except (RedisError, OSError):
+            pass
+
+
+def make_redis_client(url: Optional[str], *, timeout_s: float) -> Optional[redis_asyncio.Redis]:
+    if not url:
+        return None
+    return redis_asyncio.Redis.from_url(url, socket_timeout=timeout_s, socket_connect_timeout=timeout_s)
 
 
 def make_cache_key(*parts: object) -> str:
-    return "|".join(str(part) for part in parts)
+    """Fixed-size key (32 hex chars) for arbitrary parts, e.g. long free-text queries.
+
+    The raw parts are not recoverable from the key; store them in the cached value if needed.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import traceback
+
+import aiohttp
+import numpy as np
+import orjson
+import pytest
+from yarl import URL
+
+from app.services import accessibility
+from app.services.cache import RedisJSONCache, TTLCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(accessibility, "_geocode_cache", TTLCache(ttl_s=60.0, max_size=16))
+    monkeypatch.setattr(accessibility, "_search_cache", TTLCache(ttl_s=60.0, max_size=16))
+    monkeypatch.setattr(accessibility, "_geocode_errors", TTLCache(ttl_s=30.0, max_size=16))
+    monkeypatch.setattr(accessibility, "_search_errors", TTLCache(ttl_s=30.0, max_size=16))
+    monkeypatch.setattr(accessibility, "_geocode_shared", None)
+    monkeypatch.setattr(accessibility, "_search_shared", None)
+
+
+@pytest.fixture(autouse=True)
+def no_waiting(monkeypatch):
+    monkeypatch.setattr(accessibility, "_nominatim_limiter", accessibility._HostLimiter(1))
+    monkeypatch.setattr(accessibility, "_RETRY_BASE_S", 0.0)
+
+
+REQUEST_INFO = aiohttp.RequestInfo(URL("https://upstream.test/"), "GET", {}, URL("https://upstream.test/"))
+
+
+class FakeStream:
+    def __init__(self, data):
+        self._data = data
+
+    async def read(self, n=-1):
+        await asyncio.sleep(0)
+        if n < 0:
+            n = len(self._data)
+        chunk, self._data = self._data[:n], self._data[n:]
+        return chunk
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200, headers=None, sized=True):
+        self._body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        self.status = status
+        self.request_info = REQUEST_INFO
+        self.history = ()
+        self.headers = headers or {}
+        self.content_length = len(self._body) if sized else None
+        self.content = FakeStream(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(self.request_info, (), status=self.status, headers=self.headers)
+
+    async def read(self):
+        await asyncio.sleep(0)  # let concurrent callers interleave
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, payload, status=200, statuses=(), sized=True, headers=None):
+        self.payload = payload
+        self.status = status
+        self.sized = sized
+        self.headers = headers
+        self.statuses = list(statuses)  # per-call statuses before falling back to `status`
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method.lower(), url, kwargs))
+        status = self.statuses.pop(0) if self.statuses else self.status
+        return FakeResponse(self.payload, status, headers=self.headers, sized=self.sized)
+
+
+def _element(osm_id, lat, lon, **tags):
+    return {"type": "node", "id": osm_id, "lat": lat, "lon": lon, "tags": tags}
+
+
+def test_fetch_accessible_places_sorts_and_dedups():
+    payload = {
+        "elements": [
+            _element(2, 52.5010, 13.4, name="Far"),
+            _element(1, 52.5001, 13.4, name="Near"),
+            _element(1, 52.5001, 13.4, name="Near"),
+        ]
+    }
+    session = FakeSession(payload)
+
+    places = asyncio.run(
+        accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="hospital", radius_m=500)
+    )
+
+    assert [p.name for p in places] == ["Near", "Far"]
+    assert len(session.calls) == 1
+    assert places[0].distance_m < places[1].distance_m
+    assert [p.model_dump()["osm_id"] for p in places] == [1, 2]
+
+
+def test_fetch_accessible_places_filters_by_tags():
+    payload = {
+        "elements": [
+            _element(1, 52.5001, 13.4, name="Ramp", wheelchair="yes", step_count="0"),
+            _element(2, 52.5002, 13.4, name="Stairs", wheelchair="yes", step_count="3"),
+            _element(3, 52.5003, 13.4, name="Unknown"),
+        ]
+    }
+    session = FakeSession(payload)
+
+    places = asyncio.run(
+        accessibility.fetch_accessible_places(
+            session, lat=52.5, lon=13.4, category="cafe", radius_m=500, wheelchair="yes", step_free=True
+        )
+    )
+
+    assert [p.name for p in places] == ["Ramp"]
+
+
+def test_search_results_are_shared_through_redis(monkeypatch, fake_redis):
+    shared = RedisJSONCache(fake_redis, namespace="af:search:", ttl_s=60.0)
+    monkeypatch.setattr(accessibility, "_search_shared", shared)
+    session = FakeSession({"elements": [_element(1, 52.5001, 13.4, name="Near")]})
+
+    first = asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+    # Simulate another worker process: empty local cache, same Redis.
+    monkeypatch.setattr(accessibility, "_search_cache", TTLCache(ttl_s=60.0, max_size=16))
+    second = asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+    assert len(session.calls) == 1
+    assert [p.model_dump() for p in second] == [p.model_dump() for p in first]
+
+
+def test_concurrent_identical_searches_share_one_upstream_call():
+    session = FakeSession({"elements": [_element(1, 52.5001, 13.4, name="Near")]})
+
+    async def scenario():
+        return await asyncio.gather(
+            *[accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe") for _ in range(3)]
+        )
+
+    results = asyncio.run(scenario())
+
+    assert len(session.calls) == 1
+    assert all([p.name for p in places] == ["Near"] for places in results)
+    assert accessibility._inflight == {}
+
+
+def test_overpass_uses_get_for_short_queries_and_post_for_long_ones():
+    session = FakeSession({"elements": []})
+
+    asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+    asyncio.run(
+        accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="name=" + "x" * 9000)
+    )
+
+    (short_method, _, short_kwargs), (long_method, _, long_kwargs) = session.calls
+    assert short_method == "get" and "data" in short_kwargs["params"]
+    assert long_method == "post" and "data" in long_kwargs["data"]
+
+
+def test_geocode_not_found_is_negative_cached():
+    session = FakeSession([])
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Location not found"):
+            asyncio.run(accessibility.geocode_query(session, "nowhere at all"))
+
+    assert len(session.calls) == 1
+
+
+def test_overpass_server_errors_are_negative_cached():
+    session = FakeSession({}, status=504)
+
+    for _ in range(2):
+        with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+            asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+        assert excinfo.value.status == 504
+
+    assert len(session.calls) == accessibility._RETRY_ATTEMPTS
+
+
+def test_replayed_cached_errors_do_not_accumulate_tracebacks():
+    def replay(call):
+        with pytest.raises((ValueError, aiohttp.ClientResponseError)) as excinfo:
+            asyncio.run(call())
+        return excinfo.value, len(traceback.extract_tb(excinfo.value.__traceback__))
+
+    not_found = FakeSession([])
+    overloaded = FakeSession({}, status=503)
+    calls = [
+        lambda: accessibility.geocode_query(not_found, "nowhere at all"),
+        lambda: accessibility.fetch_accessible_places(overloaded, lat=52.5, lon=13.4, category="cafe"),
+    ]
+    for call in calls:
+        replay(call)  # populates the negative cache
+        first, first_depth = replay(call)
+        second, second_depth = replay(call)
+
+        assert first is not second
+        assert first_depth == second_depth
+
+    assert len(not_found.calls) == 1
+    assert second.status == 503
+    assert "upstream.test" in str(second)
+
+
+@pytest.mark.parametrize("sized", [True, False])
+def test_non_json_upstream_body_is_an_upstream_error(sized):
+    session = FakeSession(b"<html>Server busy</html>", sized=sized)
+
+    with pytest.raises(aiohttp.ClientResponseError, match="Invalid JSON body"):
+        asyncio.run(accessibility.geocode_query(session, "berlin"))
+    with pytest.raises(aiohttp.ClientResponseError, match="Invalid JSON body"):
+        asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+
+def test_host_limiter_releases_slot_when_cancelled_while_spacing():
+    async def scenario():
+        limiter = accessibility._HostLimiter(1, min_interval_s=0.2)
+        async with limiter:
+            pass
+
+        async def enter():
+            async with limiter:
+                pass
+
+        waiter = asyncio.ensure_future(enter())
+        await asyncio.sleep(0.01)  # waiter holds the slot and sleeps out the interval
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(enter(), timeout=1.0)
+
+    asyncio.run(scenario())
+
+
+def test_transient_upstream_errors_are_retried():
+    session = FakeSession([{"lat": "52.5", "lon": "13.4", "display_name": "Berlin"}], statuses=[429, 503])
+
+    assert asyncio.run(accessibility.geocode_query(session, "berlin")) == (52.5, 13.4, "Berlin")
+    assert len(session.calls) == 3
+
+
+def test_retry_delay_prefers_retry_after_header(monkeypatch):
+    monkeypatch.setattr(accessibility, "_RETRY_BASE_S", 0.5)
+
+    def delay(attempt, **headers):
+        return accessibility._retry_delay_s(aiohttp.ClientResponseError(None, (), status=503, headers=headers), attempt)
+
+    assert delay(0, **{"Retry-After": "2"}) == 2.0
+    assert delay(0, **{"Retry-After": "3600"}) == accessibility._RETRY_MAX_DELAY_S
+    assert 1.0 <= delay(1) <= 1.5
+
+
+def test_overpass_client_errors_are_not_cached():
+    session = FakeSession({}, status=400)
+
+    for _ in range(2):
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+    assert len(session.calls) == 2
+
+
+def test_overpass_query_unions_category_filters():
+    query = accessibility._overpass_query(
+        52.5, 13.4, 500, [("amenity", "hospital"), ("amenity", "clinic")], "yes", None
+    )
+
+    assert query.count("node(around:500,52.5,13.4)") == 2
+    assert "way(around:500,52.5,13.4)[amenity=clinic][wheelchair=yes];" in query
+    assert query.count("(\n") == 1
+    assert query.endswith("out center tags;\n")
+
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    """Scalar reference formula for `_haversine_many_m`."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 6371000.0 * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def test_haversine_many_matches_scalar():
+    lats = np.array([52.5, 48.8566, -33.8688, -51.5074, 51.5074])
+    lons = np.array([13.4, 2.3522, 151.2093, 179.8722, -0.1278])
+
+    dists = accessibility._haversine_many_m(51.5074, -0.1278, lats, lons)
+
+    expected = [_haversine_m(51.5074, -0.1278, a, b) for a, b in zip(lats, lons)]
+    assert np.allclose(dists, expected)
+
+
+def test_unknown_wheelchair_filter_matches_missing_tag():
+    payload = {
+        "elements": [
+            _element(1, 52.5001, 13.4, name="Untagged"),
+            _element(2, 52.5002, 13.4, name="Explicit", wheelchair="unknown"),
+            _element(3, 52.5003, 13.4, name="Tagged", wheelchair="yes"),
+        ]
+    }
+    session = FakeSession(payload)
+
+    places = asyncio.run(
+        accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe", wheelchair="unknown")
+    )
+
+    assert [p.name for p in places] == ["Untagged", "Explicit"]
+
+
+def test_nearest_candidates_keeps_closest_points():
+    lats = np.array([52.6, 52.5001, 52.9, 52.5002, 52.7])
+    lons = np.array([13.4, 13.4, 13.4, 13.4, 13.4])
+
+    assert accessibility._nearest_candidates(52.5, 13.4, lats, lons, 2).tolist() == [1, 3]
+    assert accessibility._nearest_candidates(52.5, 13.4, lats, lons, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_nearest_candidates_across_antimeridian():
+    lats = np.array([0.0, 0.0])
+    lons = np.array([-179.99, 170.0])
+
+    assert accessibility._nearest_candidates(0.0, 179.99, lats, lons, 1).tolist() == [0]
+
+
+def test_limit_returns_nearest_places():
+    elements = [_element(i, 52.5 + i * 0.001, 13.4, name=f"P{i}") for i in range(30, 0, -1)]
+    session = FakeSession({"elements": elements})
+
+    places = asyncio.run(
+        accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe", limit=3)
+    )
+
+    assert [p.name for p in places] == ["P1", "P2", "P3"]
+
+
+def test_unsized_overpass_response_is_stream_parsed():
+    elements = [
+        _element(1, 52.5002, 13.4, name="Second", wheelchair="yes"),
+        _element(2, 52.5001, 13.4, name="First", wheelchair="yes"),
+        _element(3, 52.5000, 13.4, name="Filtered", wheelchair="no"),
+        {"type": "way", "id": 4, "center": {"lat": 52.5003, "lon": 13.4}, "tags": {"wheelchair": "yes"}},
+    ]
+    session = FakeSession({"version": 0.6, "elements": elements}, sized=False)
+
+    places = asyncio.run(
+        accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe", wheelchair="yes")
+    )
+
+    assert [p.name for p in places] == ["First", "Second", "cafe (way:4)"]
+    assert all(isinstance(p.lat, float) for p in places)
+
+
+def test_small_compressed_overpass_response_is_read_whole(monkeypatch):
+    session = FakeSession({"elements": [_element(1, 52.5001, 13.4, name="Near")]}, headers={"Content-Encoding": "gzip"})
+    reads = []
+
+    async def spy_read_json(resp):
+        reads.append(resp)
+        return await read_json(resp)
+
+    read_json = accessibility._read_json
+    monkeypatch.setattr(accessibility, "_read_json", spy_read_json)
+
+    places = asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+    assert [p.name for p in places] == ["Near"]
+    assert len(reads) == 1
+
+
+def test_large_compressed_overpass_response_is_stream_parsed(monkeypatch):
+    session = FakeSession({"elements": [_element(1, 52.5001, 13.4, name="Near")]}, headers={"Content-Encoding": "gzip"})
+    # Below the uncompressed threshold, but above the compressed one: must not be read() in one go.
+    monkeypatch.setattr(accessibility, "_OVERPASS_STREAM_MIN_COMPRESSED_BYTES", 16)
+    monkeypatch.setattr(FakeResponse, "read", None)
+
+    places = asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+    assert [p.name for p in places] == ["Near"]
+
+
+def test_truncated_streamed_overpass_body_is_an_upstream_error():
+    session = FakeSession(b'{"elements": [{"type": "node", "id": 1, "lat": 52.5', sized=False)
+
+    with pytest.raises(aiohttp.ClientResponseError, match="Invalid JSON body"):
+        asyncio.run(accessibility.fetch_accessible_places(session, lat=52.5, lon=13.4, category="cafe"))
+
+
+def test_place_collector_compacts_to_nearest():
+    collector = accessibility._PlaceCollector(
+        52.5, 13.4, 2, wheelchair=None, toilets_wheelchair=None, step_free=None, batch=3
+    )
+    for i in range(20, 0, -1):
+        collector.feed(_element(i, 52.5 + i * 0.001, 13.4))
+        assert len(collector._kept) < 2 + 3
+
+    assert [osm_id for _, osm_id, *_ in collector.nearest()] == [1, 2]
+
+
+def test_step_free_value():
+    assert accessibility._step_free_value({"step_free": " Yes "}) is True
+    assert accessibility._step_free_value({"entrance:step_free": "no"}) is False
+    assert accessibility._step_free_value({"step_count": "0"}) is True
+    assert accessibility._step_free_value({"entrance:step_count": "2"}) is False
+    assert accessibility._step_free_value({"step_count": "many"}) is None
+    assert accessibility._step_free_value({}) is None
+    # an unrecognised value falls through to the next key
+    assert accessibility._step_free_value({"step_free_access": "limited", "step_free": "no"}) is False
+    assert accessibility._step_free_value({"entrance:step_count": "?", "step_count": "0"}) is True
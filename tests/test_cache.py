@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from app.services.cache import TTLCache
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services.cache import RedisJSONCache, ThreadSafeTTLCache, TTLCache, make_cache_key
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise RedisConnectionError("down")
+
+    async def setex(self, key, ttl, value):
+        raise RedisConnectionError("down")
 
 
 def test_ttl_cache_set_get(monkeypatch):
@@ -37,3 +50,81 @@ def test_ttl_cache_evicts_oldest(monkeypatch):
     assert cache.get("a") is None
     assert cache.get("b") == "two"
     assert cache.get("c") == "three"
+
+
+def test_ttl_cache_evicts_least_recently_used(monkeypatch):
+    times = {"value": 0.0}
+
+    def fake_monotonic():
+        return times["value"]
+
+    monkeypatch.setattr("app.services.cache.time.monotonic", fake_monotonic)
+
+    cache = TTLCache[str](ttl_s=100.0, max_size=2)
+    cache.set("a", "one")
+    cache.set("b", "two")
+    assert cache.get("a") == "one"
+    cache.set("c", "three")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "one"
+    assert cache.get("c") == "three"
+
+
+def test_ttl_cache_overwrite_does_not_evict(monkeypatch):
+    monkeypatch.setattr("app.services.cache.time.monotonic", lambda: 0.0)
+
+    cache = TTLCache[str](ttl_s=100.0, max_size=2)
+    cache.set("a", "one")
+    cache.set("b", "two")
+    cache.set("a", "uno")
+
+    assert cache.get("a") == "uno"
+    assert cache.get("b") == "two"
+
+
+def test_redis_json_cache_roundtrip(fake_redis):
+    cache = RedisJSONCache(fake_redis, namespace="af:test:", ttl_s=120.0)
+
+    async def scenario():
+        await cache.set("key", [1.5, 2.5, "name"])
+        return await cache.get("key"), await cache.get("missing")
+
+    hit, miss = asyncio.run(scenario())
+
+    assert hit == [1.5, 2.5, "name"]
+    assert miss is None
+    assert fake_redis.ttls == {"af:test:key": 120}
+
+
+def test_redis_json_cache_swallows_errors():
+    cache = RedisJSONCache(BrokenRedis(), namespace="af:test:", ttl_s=120.0)
+
+    async def scenario():
+        await cache.set("key", {"a": 1})
+        return await cache.get("key")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_make_cache_key_is_fixed_size_and_deterministic():
+    short = make_cache_key("geocode", "berlin")
+    long = make_cache_key("geocode", "x" * 1000)
+
+    assert len(short) == len(long) == 32
+    assert short == make_cache_key("geocode", "berlin")
+    assert short != make_cache_key("geocode", "paris")
+
+
+def test_thread_safe_ttl_cache_from_threads():
+    cache = ThreadSafeTTLCache[int](ttl_s=100.0, max_size=50)
+
+    def worker(n):
+        for i in range(200):
+            cache.set(f"{n}:{i}", i)
+            cache.get(f"{n}:{i // 2}")
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(worker, range(4)))
+
+    assert len(cache._store) == 50